@@ -57,6 +57,7 @@ class UserModelAdmin(admin.ModelAdmin):
 
 class ReportedChatModelAdmin(admin.ModelAdmin):
     search_fields = ["reported__username"]
+    list_select_related = ["reporter", "reported"]
 
     def has_add_permission(self, request, obj=None):
         return False
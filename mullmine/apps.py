@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MullmineConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "mullmine"
+
+    def ready(self):
+        import mullmine.signals  # noqa: F401
@@ -53,7 +53,9 @@ def get_user(token):
     )
     firebase_user = auth.get_user(uid)
     is_verified = firebase_user.email_verified
-    User.objects.filter(username=uid).update(is_verified=is_verified)
+    if user.is_verified != is_verified:
+        User.objects.filter(id=user.id).update(is_verified=is_verified)
+        user.is_verified = is_verified
 
     return user
 
@@ -5,6 +5,7 @@ import logging
 from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 
+from mullmine.exceptions import RoomFull
 from mullmine.helpers import (
     add_user_to_room,
     get_room,
@@ -232,9 +233,8 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
 
     async def fetch_prev_messages(self, input_payload):
         oldest_msg_id = input_payload.get("oldest_message_id", "")
-        room = await database_sync_to_async(get_room)(self.room_id)
         messages = await database_sync_to_async(get_prev_messages)(
-            oldest_msg_id, room, self.user
+            oldest_msg_id, self.room_id, self.user
         )
         await self.channel_layer.send(
             self.channel_name, {"type": "messages", "messages": messages}
@@ -251,27 +251,31 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
 
     async def initialize_room(self, input_payload):
         room_id = input_payload.get("room")
-        is_room_full = await database_sync_to_async(check_room_full)(room_id, self.user)
-        if not is_room_full:
-            room = await database_sync_to_async(initialize_room)(room_id, self.user)
-            if room:
-                self.room_id = str(room.id)
-                await self.channel_layer.group_add(self.room_id, self.channel_name)
+        room = await database_sync_to_async(initialize_room)(room_id, self.user)
+        if room and not check_room_full(room):
+            previous_room_id = self.room_id
+            self.room_id = str(room.id)
+            await self.channel_layer.group_add(self.room_id, self.channel_name)
+            try:
                 await self.add_user_to_room(room)
-                await self.fetch_initial_messages(room)
-                await self.fetch_question(room)
-                await self.read_conversation()
-                await self.channel_layer.send(
-                    self.channel_name, {"type": "room", "room": str(room.id)}
-                )
-                usernames = await database_sync_to_async(get_all_member_usernames)(
-                    self.room_id
+            except RoomFull:
+                await self.channel_layer.group_discard(self.room_id, self.channel_name)
+                self.room_id = previous_room_id
+                return
+            await self.fetch_initial_messages(room)
+            await self.fetch_question(room)
+            await self.read_conversation()
+            await self.channel_layer.send(
+                self.channel_name, {"type": "room", "room": str(room.id)}
+            )
+            usernames = await database_sync_to_async(get_all_member_usernames)(
+                self.room_id
+            )
+            for username in usernames:
+                await self.channel_layer.group_send(
+                    username,
+                    {"type": "refresh_conversations"},
                 )
-                for username in usernames:
-                    await self.channel_layer.group_send(
-                        username,
-                        {"type": "refresh_conversations"},
-                    )
 
     async def send_message(self, input_payload):
         message = input_payload.get("message", "")
@@ -434,9 +438,8 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
         await self.send_json(event)
 
     async def refreshed_messages(self, event):
-        room = await database_sync_to_async(get_room)(self.room_id)
         messages = await database_sync_to_async(get_refreshed_messages)(
-            room, self.oldest_message_timestamp, self.user
+            self.room_id, self.oldest_message_timestamp, self.user
         )
         event["refreshed_messages"] = messages
         await self.send_json(event)
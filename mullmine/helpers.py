@@ -1,8 +1,8 @@
 import logging
+from datetime import timezone
 
-from django.contrib.postgres.aggregates import ArrayAgg
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.db.models import (
     F,
     Count,
@@ -11,17 +11,45 @@ from django.db.models import (
     When,
     FloatField,
     OuterRef,
-    Max,
+    Exists,
+    Subquery,
     BooleanField,
+    TextField,
+    Value,
 )
-from django.db.models.functions import Cast
+from django.db.models.functions import Cast, Extract
 from django.db.models.lookups import GreaterThan
 from firebase_admin.auth import delete_user as delete_firebase_user
 
+from mullmine.exceptions import RoomFull
 from mullmine.models import Room, Message, User, Conversation, ReportedChat
+from mullmine.signals import count_members
 
 NUM_MESSAGES_PER_PAGE = 10
+MAX_REFRESHED_MESSAGES = 500
 FULL_ROOM_NUM_MEMBERS = 5
+MAX_SUGGESTION_CANDIDATES = 50
+NUM_MEMBERS_ONLINE = Count("members", filter=Q(members__is_online=True))
+LATEST_MESSAGE_TIMESTAMP = Subquery(
+    Message.objects.filter(room__id=OuterRef("id"))
+    .order_by("-created_at")
+    .values("created_at")[:1]
+)
+CHATTINESS_SCORE = Case(
+    When(
+        GreaterThan(F("num_your_messages"), 0)
+        & GreaterThan(F("num_not_your_messages"), 0),
+        then=Cast(F("num_messages"), FloatField())
+        * Cast(F("num_your_messages"), FloatField())
+        / Cast(F("num_not_your_messages"), FloatField()),
+    ),
+    default=0,
+    output_field=FloatField(),
+)
+
+
+def to_timestamp(field_name):
+    return Cast(Extract(field_name, "epoch", tzinfo=timezone.utc), FloatField())
 
 
 def create_room(question):
@@ -34,16 +62,19 @@ def get_question(room):
 
 
 def get_all_room_ids(user):
-    room_ids = list(user.room_set.all().values_list("id", flat=True))
-    return room_ids
+    return list(user.room_set.values_list("id", flat=True))
+
+
+def get_blocked_user_ids(user):
+    return list(user.blocked_users.values_list("id", flat=True))
 
 
 def set_online(username):
-    User.objects.filter(username=username).update(is_online=True)
+    User.objects.filter(username=username, is_online=False).update(is_online=True)
 
 
 def set_offline(username):
-    User.objects.filter(username=username).update(is_online=False)
+    User.objects.filter(username=username, is_online=True).update(is_online=False)
 
 
 def delete_user(user):
@@ -51,77 +82,89 @@ def delete_user(user):
     user.delete()
 
 
+def get_fellow_room_member(room_id, user, username):
+    is_member = Room.members.through.objects.filter(room_id=room_id, user_id=user.id)
+    return (
+        User.objects.filter(username=username, room__id=room_id)
+        .filter(Exists(is_member))
+        .first()
+    )
+
+
 def block_room_user(room_id, user, username):
-    room = Room.objects.filter(id=room_id).first()
-    if room:
-        blocked_user = room.members.filter(username=username).first()
-        if blocked_user and room.members.filter(username=user.username).exists():
-            user.blocked_users.add(blocked_user)
+    blocked_user = get_fellow_room_member(room_id, user, username)
+    if blocked_user:
+        user.blocked_users.add(blocked_user)
 
 
-def log_reported_chat(room, reporter, reported_username):
-    reported = User.objects.get(username=reported_username)
+def log_reported_chat(room_id, reporter, reported):
     ReportedChat.objects.get_or_create(
-        reported_room=room, reporter=reporter, reported=reported
+        reported_room_id=room_id, reporter=reporter, reported=reported
     )
 
 
 def report_room_user(room_id, user, username):
-    room = Room.objects.filter(id=room_id).first()
-    if room:
-        reported_user = room.members.filter(username=username).first()
-        if reported_user and room.members.filter(username=user.username).exists():
-            user.reported_users.add(reported_user)
-            log_reported_chat(room, user, reported_user)
+    reported_user = get_fellow_room_member(room_id, user, username)
+    if reported_user:
+        user.reported_users.add(reported_user)
+        log_reported_chat(room_id, user, reported_user)
 
 
 def leave_room(user, room_id):
-    room_to_leave = Room.objects.get(id=room_id)
-    if user in room_to_leave.members.all():
-        user.conversation_set.filter(room=room_to_leave).delete()
-        room_to_leave.members.remove(user)
-        if room_to_leave.members.count() == 0:
-            room_to_leave.delete()
+    membership = Room.members.through.objects.filter(room_id=room_id, user_id=user.id)
+    with transaction.atomic():
+        num_deleted, _ = membership.delete()
+        if num_deleted:
+            Conversation.objects.filter(participant=user, room_id=room_id).delete()
+            count_members([room_id])
+            Room.objects.filter(id=room_id, num_members=0).delete()
 
 
 def read_unread_conversation(room_id, user):
-    room = Room.objects.get(id=room_id)
-    conversation = Conversation.objects.get(participant=user, room=room)
-    if not conversation.read:
-        Conversation.objects.filter(id=conversation.id).update(read=True)
+    Conversation.objects.filter(participant=user, room_id=room_id, read=False).update(
+        read=True
+    )
 
 
 def get_user_conversations(username):
-    user = User.objects.get(username=username)
-    conversations = list(
-        user.conversation_set.values(
-            "room__id",
+    conversations = (
+        Conversation.objects.filter(participant__username=username)
+        .annotate(
+            room_id_str=Cast("room_id", TextField()),
+            latest_message_timestamp=to_timestamp("latest_message__created_at"),
+            created_at_timestamp=to_timestamp("created_at"),
+        )
+        .values(
+            "room_id_str",
             "room__question",
             "read",
             "latest_message__creator__display_name",
             "latest_message__content",
-            "latest_message__created_at",
-            "created_at",
-        ).order_by(
+            "latest_message_timestamp",
+            "created_at_timestamp",
+        )
+        .order_by(
             "read", F("latest_message__created_at").desc(nulls_last=True), "-created_at"
         )
     )
-    for conversation in conversations:
-        conversation["room__id"] = str(conversation["room__id"])
-        conversation["created_at"] = conversation["created_at"].timestamp()
-        if conversation["latest_message__created_at"]:
-            conversation["latest_message__created_at"] = conversation[
-                "latest_message__created_at"
-            ].timestamp()
-    return conversations
+    return [
+        {
+            "room__id": conversation["room_id_str"],
+            "room__question": conversation["room__question"],
+            "read": conversation["read"],
+            "latest_message__creator__display_name": conversation[
+                "latest_message__creator__display_name"
+            ],
+            "latest_message__content": conversation["latest_message__content"],
+            "latest_message__created_at": conversation["latest_message_timestamp"],
+            "created_at": conversation["created_at_timestamp"],
+        }
+        for conversation in conversations
+    ]
 
 
-def check_room_full(room_id, user):
-    room = Room.objects.filter(id=room_id)
-    if room.exists():
-        room = room.first()
-        is_member = room.members.filter(username=user.username).exists()
-        return room.members.all().count() >= FULL_ROOM_NUM_MEMBERS and not is_member
+def check_room_full(room):
+    return room.num_members >= FULL_ROOM_NUM_MEMBERS and not room.is_member
 
 
 def get_room(room_id):
@@ -132,25 +175,22 @@ def get_room(room_id):
         logging.error(f"Room id {room_id} does not exist")
 
 
+def count_members_in(user_ids):
+    if not user_ids:
+        return Value(0)
+    return Count("members", filter=Q(members__id__in=user_ids))
+
+
 def get_active_questions(user):
-    most_chatted_users = get_most_chatted_users_of_most_chatted_users(user)
-    num_most_chatted_users = Count(
-        "members", filter=Q(members__in=most_chatted_users), distinct=True
-    )
+    most_chatted_user_ids = get_most_chatted_user_ids(user)
+    num_most_chatted_users = count_members_in(most_chatted_user_ids)
     blocked_users_ids = user.blocked_users.all().values_list("id", flat=True)
-    num_blocked_users = Count(
-        "members", filter=Q(members__id__in=blocked_users_ids), distinct=True
-    )
-    num_members = Count("members", distinct=True)
-    num_members_online = Count(
-        "members", filter=Q(members__is_online=True), distinct=True
-    )
+    num_blocked_users = Count("members", filter=Q(members__id__in=blocked_users_ids))
     rooms = (
-        Room.objects.annotate(num_members=num_members)
-        .annotate(num_most_chatted_users=num_most_chatted_users)
-        .annotate(num_members_online=num_members_online)
+        Room.objects.annotate(num_most_chatted_users=num_most_chatted_users)
+        .annotate(num_members_online=NUM_MEMBERS_ONLINE)
         .annotate(num_blocked_users=num_blocked_users)
-        .annotate(latest_msg=Max("message__created_at"))
+        .annotate(latest_msg=LATEST_MESSAGE_TIMESTAMP)
         .filter(
             num_members__lt=FULL_ROOM_NUM_MEMBERS,
             num_blocked_users=0,
@@ -162,99 +202,70 @@ def get_active_questions(user):
             "-created_at",
             "-num_members",
         )
-        .values()[:10]
+        .annotate(id_str=Cast("id", TextField()))
+        .values("id_str", "question")[:10]
     )
-    return [{"question": room["question"], "id": str(room["id"])} for room in rooms]
+    return [{"question": room["question"], "id": room["id_str"]} for room in rooms]
+
+
+def count_room_messages(messages):
+    return Subquery(messages.values("room").annotate(count=Count("*")).values("count"))
 
 
 def get_most_chatted_users(user, exclude_room_ids=None):
-    num_members = Count("members", distinct=True)
-    num_messages = Count("message", distinct=True)
-    num_your_messages = Count("message", filter=Q(message__creator=user), distinct=True)
-    num_not_your_messages = Count(
-        "message", filter=~Q(message__creator=user), distinct=True
-    )
-    chattiness_score = Case(
-        When(
-            GreaterThan(F("num_your_messages"), 0)
-            & GreaterThan(F("num_not_your_messages"), 0),
-            then=Cast(F("num_messages"), FloatField())
-            * Cast(F("num_your_messages"), FloatField())
-            / Cast(F("num_not_your_messages"), FloatField()),
-        ),
-        default=0,
-        output_field=FloatField(),
-    )
-    other_members_ids = ArrayAgg(
-        "members__id",
-        filter=~Q(members__id=user.id),
-        distinct=True,
-    )
+    room_messages = Message.objects.filter(room=OuterRef("pk"))
+    num_messages = count_room_messages(room_messages)
+    num_your_messages = count_room_messages(room_messages.filter(creator=user))
+    num_not_your_messages = count_room_messages(room_messages.exclude(creator=user))
     your_chattiest_rooms = (
-        Room.objects.annotate(num_members=num_members)
-        .annotate(num_messages=num_messages)
+        Room.objects.annotate(num_messages=num_messages)
         .annotate(num_your_messages=num_your_messages)
         .annotate(num_not_your_messages=num_not_your_messages)
-        .annotate(num_not_your_messages=num_not_your_messages)
-        .annotate(chattiness_score=chattiness_score)
-        .annotate(other_members_ids=other_members_ids)
+        .annotate(chattiness_score=CHATTINESS_SCORE)
         .filter(members=user, num_members__lte=FULL_ROOM_NUM_MEMBERS)
         .order_by("-chattiness_score")
-        .values("other_members_ids")
+        .values("id")
     )
     if exclude_room_ids:
         your_chattiest_rooms = your_chattiest_rooms.exclude(id__in=exclude_room_ids)
-    members_ids = set()
-    for room in your_chattiest_rooms[:5]:
-        for member_id in room["other_members_ids"]:
-            members_ids.add(member_id)
+    members_ids = (
+        Room.members.through.objects.filter(room_id__in=your_chattiest_rooms[:5])
+        .exclude(user_id=user.id)
+        .values("user_id")
+    )
     return User.objects.filter(id__in=members_ids)
 
 
-def get_most_chatted_users_of_most_chatted_users(user):
+def get_most_chatted_users_of_most_chatted_users(user, user_rooms_ids=None):
     top_most_chatted_users = get_most_chatted_users(user)
-    exclude_room_ids = user.room_set.all().values_list("id", flat=True)
+    if user_rooms_ids is None:
+        user_rooms_ids = get_all_room_ids(user)
     users = User.objects.none()
-    for top_user in top_most_chatted_users:
-        top_user_most_chatted_users = get_most_chatted_users(
-            top_user, exclude_room_ids=exclude_room_ids
-        )
-        if not users:
-            users = top_user_most_chatted_users
-        else:
-            users.union(top_user_most_chatted_users)
+    for top_user in top_most_chatted_users.only("id"):
+        users |= get_most_chatted_users(top_user, exclude_room_ids=user_rooms_ids)
     return users
 
 
+def get_most_chatted_user_ids(user, user_rooms_ids=None):
+    users = get_most_chatted_users_of_most_chatted_users(user, user_rooms_ids)
+    return list(users.values_list("id", flat=True))
+
+
 def get_all_chats(user, question):
     blocked_users_ids = user.blocked_users.all().values_list("id", flat=True)
-    num_blocked_users = Count(
-        "members", filter=Q(members__id__in=blocked_users_ids), distinct=True
-    )
-    num_members = Count("members", distinct=True)
-    num_members_online = Count(
-        "members", filter=Q(members__is_online=True), distinct=True
-    )
-    most_chatted_users = get_most_chatted_users_of_most_chatted_users(user)
-    num_most_chatted_users = Count(
-        "members", filter=Q(members__in=most_chatted_users), distinct=True
-    )
-    user_rooms_ids = user.room_set.all().values_list("id", flat=True)
-    already_joined = Case(
-        When(id__in=user_rooms_ids, then=True), output_field=BooleanField()
-    )
-    latest_message_timestamp = (
-        Message.objects.filter(room__id=OuterRef("id"))
-        .order_by("-created_at")
-        .values("created_at")[:1]
+    num_blocked_users = Count("members", filter=Q(members__id__in=blocked_users_ids))
+    user_rooms_ids = get_all_room_ids(user)
+    most_chatted_user_ids = get_most_chatted_user_ids(user, user_rooms_ids)
+    num_most_chatted_users = count_members_in(most_chatted_user_ids)
+    already_joined = Exists(
+        Room.members.through.objects.filter(room_id=OuterRef("id"), user_id=user.id)
     )
     rooms = (
         Room.objects.all()
-        .annotate(num_members=num_members)
-        .annotate(num_members_online=num_members_online)
+        .annotate(num_members_online=NUM_MEMBERS_ONLINE)
         .annotate(num_blocked_users=num_blocked_users)
         .annotate(num_most_chatted_users=num_most_chatted_users)
-        .annotate(latest_message_timestamp=latest_message_timestamp)
+        .annotate(latest_message_timestamp=LATEST_MESSAGE_TIMESTAMP)
         .annotate(already_joined=already_joined)
         .filter(
             num_members__lt=FULL_ROOM_NUM_MEMBERS,
@@ -262,52 +273,62 @@ def get_all_chats(user, question):
             question__icontains=question,
         )
         .order_by(
-            "already_joined",
+            "-already_joined",
             "-num_most_chatted_users",
             "-num_members_online",
             F("latest_message_timestamp").desc(nulls_last=True),
             "-created_at",
         )
+        .values("id", "question", "latest_message_timestamp", "created_at")
     )
     return rooms
 
 
 def find_rooms(user, question):
-    rooms = get_all_chats(user, question)
-    rooms = rooms[:10]
+    rooms = get_all_chats(user, question)[:10]
     return [
         {
-            "pk": str(room.id),
-            "question": room.question,
+            "pk": str(room["id"]),
+            "question": room["question"],
             "latest_message_timestamp": (
-                room.latest_message_timestamp.timestamp()
-                if hasattr(room, "latest_message_timestamp")
-                and room.latest_message_timestamp
+                room["latest_message_timestamp"].timestamp()
+                if room["latest_message_timestamp"]
                 else None
             ),
-            "created_at": room.created_at.timestamp(),
+            "created_at": room["created_at"].timestamp(),
         }
         for room in rooms
     ]
 
 
 def suggest_questions(user, question):
-    rooms = get_all_chats(user, question)
+    questions = get_all_chats(user, question).values_list("question", flat=True)
+    seen = set()
     suggestions = []
-    for room in rooms:
-        if room.question not in suggestions:
-            suggestions.append(room.question)
+    for room_question in questions[:MAX_SUGGESTION_CANDIDATES]:
+        if room_question not in seen:
+            seen.add(room_question)
+            suggestions.append(room_question)
         if len(suggestions) == 10:
             break
     return suggestions
 
 
 def initialize_room(room_id, user):
-    user = User.objects.get(username=user.username)
-    if user.is_verified:
+    is_verified = (
+        User.objects.filter(username=user.username)
+        .values_list("is_verified", flat=True)
+        .first()
+    )
+    if is_verified:
         if room_id:
+            is_member = Room.members.through.objects.filter(
+                room_id=OuterRef("id"), user_id=user.id
+            )
             try:
-                room = Room.objects.get(id=room_id)
+                room = Room.objects.annotate(is_member=Exists(is_member)).get(
+                    id=room_id
+                )
                 return room
             except ObjectDoesNotExist:
                 return None
@@ -319,11 +340,9 @@ def get_user(username):
 
 
 def get_all_members(room_id):
-    members = []
-    room = Room.objects.filter(id=room_id)
-    if room.exists():
-        room = room.first()
-        members = room.members.values("display_name", "is_online", "username")
+    members = User.objects.filter(room__id=room_id).values(
+        "display_name", "is_online", "username"
+    )
     return [
         {
             "name": member["display_name"],
@@ -335,60 +354,82 @@ def get_all_members(room_id):
 
 
 def get_all_member_usernames(room_id):
-    members = []
-    room = Room.objects.filter(id=room_id)
-    if room.exists():
-        room = room.first()
-        members = room.members.all().values("username")
-    return [member["username"] for member in members]
+    return list(
+        User.objects.filter(room__id=room_id).values_list("username", flat=True)
+    )
 
 
 def add_user_to_room(user, room):
     was_added = False
-    latest_message = room.message_set.order_by("-created_at").first()
-    if user not in room.members.all():
-        room.members.add(user)
-        Conversation.objects.create(
-            participant=user, room=room, latest_message=latest_message, read=True
+    with transaction.atomic():
+        num_members = (
+            Room.objects.select_for_update(no_key=True)
+            .filter(id=room.id)
+            .values_list("num_members", flat=True)
+            .first()
         )
-        was_added = True
+        if not room.members.filter(pk=user.pk).exists():
+            if num_members is None or num_members >= FULL_ROOM_NUM_MEMBERS:
+                raise RoomFull(room.id)
+            latest_message_id = (
+                room.message_set.order_by("-created_at")
+                .values_list("id", flat=True)
+                .first()
+            )
+            room.members.add(user)
+            Conversation.objects.create(
+                participant=user,
+                room=room,
+                latest_message_id=latest_message_id,
+                read=True,
+            )
+            was_added = True
     members = get_all_members(room.id)
     return members, was_added
 
 
+def get_message_values(messages):
+    return messages.annotate(created_at_timestamp=to_timestamp("created_at")).values(
+        "id",
+        "content",
+        "created_at_timestamp",
+        "creator__username",
+        "creator__display_name",
+    )
+
+
+def serialize_message(message):
+    return {
+        "creator_username": message["creator__username"],
+        "creator_display_name": message["creator__display_name"],
+        "content": message["content"],
+        "created_at": message["created_at_timestamp"],
+        "id": str(message["id"]),
+    }
+
+
 def get_initial_messages(room, user):
-    blocked_user_ids = user.blocked_users.all().values_list("id", flat=True)
+    blocked_user_ids = get_blocked_user_ids(user)
     messages = [
-        {
-            "creator_username": msg.creator.username,
-            "creator_display_name": msg.creator.display_name,
-            "content": msg.content,
-            "created_at": msg.created_at.timestamp(),
-            "id": str(msg.id),
-        }
-        for msg in room.message_set.exclude(creator__id__in=blocked_user_ids).order_by(
-            "-created_at"
-        )[:NUM_MESSAGES_PER_PAGE][::-1]
+        serialize_message(msg)
+        for msg in get_message_values(
+            room.message_set.exclude(creator__id__in=blocked_user_ids)
+        ).order_by("-created_at")[:NUM_MESSAGES_PER_PAGE][::-1]
     ]
     return messages
 
 
-def get_refreshed_messages(room, oldest_message_timestamp, user):
-    blocked_user_ids = user.blocked_users.all().values_list("id", flat=True)
+def get_refreshed_messages(room_id, oldest_message_timestamp, user):
+    blocked_user_ids = get_blocked_user_ids(user)
     if oldest_message_timestamp:
         messages = [
-            {
-                "creator_username": msg.creator.username,
-                "creator_display_name": msg.creator.display_name,
-                "content": msg.content,
-                "created_at": msg.created_at.timestamp(),
-                "id": str(msg.id),
-            }
-            for msg in room.message_set.filter(
-                created_at__gte=oldest_message_timestamp,
-            )
-            .exclude(creator__id__in=blocked_user_ids)
-            .order_by("-created_at")[::-1]
+            serialize_message(msg)
+            for msg in get_message_values(
+                Message.objects.filter(
+                    room_id=room_id,
+                    created_at__gte=oldest_message_timestamp,
+                ).exclude(creator__id__in=blocked_user_ids)
+            ).order_by("-created_at")[:MAX_REFRESHED_MESSAGES][::-1]
         ]
     else:
         messages = []
@@ -409,50 +450,53 @@ def create_new_message(content, room, creator):
 
 
 def is_blocked_creator(user, username):
-    creator = User.objects.get(username=username)
-    return creator in user.blocked_users.all()
+    return user.blocked_users.filter(username=username).exists()
 
 
 def update_conversations_for_new_message(room, message):
-    for user in room.members.all():
-        if message.creator not in user.blocked_users.all():
-            conversation = Conversation.objects.get(participant=user, room=room)
-            Conversation.objects.filter(id=conversation.id).update(
-                latest_message=message, read=user == message.creator
-            )
+    Conversation.objects.filter(room=room).exclude(
+        participant__blocked_users=message.creator
+    ).update(
+        latest_message=message,
+        read=Case(
+            When(participant=message.creator, then=True),
+            default=False,
+            output_field=BooleanField(),
+        ),
+    )
 
 
-def get_prev_messages(oldest_msg_id, room, user):
-    blocked_user_ids = user.blocked_users.all().values_list("id", flat=True)
+def get_prev_messages(oldest_msg_id, room_id, user):
+    blocked_user_ids = get_blocked_user_ids(user)
     messages = []
-    oldest_msg = Message.objects.filter(id=oldest_msg_id, room=room)
-    if oldest_msg.exists():
-        oldest_msg = oldest_msg.first()
+    oldest_msg_created_at = (
+        Message.objects.filter(id=oldest_msg_id, room_id=room_id)
+        .values_list("created_at", flat=True)
+        .first()
+    )
+    if oldest_msg_created_at is not None:
         messages = [
-            {
-                "creator_username": msg.creator.username,
-                "creator_display_name": msg.creator.display_name,
-                "content": msg.content,
-                "created_at": msg.created_at.timestamp(),
-                "id": str(msg.id),
-            }
-            for msg in room.message_set.filter(created_at__lt=oldest_msg.created_at)
-            .exclude(creator__id__in=blocked_user_ids)
-            .order_by("-created_at")[:NUM_MESSAGES_PER_PAGE][::-1]
+            serialize_message(msg)
+            for msg in get_message_values(
+                Message.objects.filter(
+                    room_id=room_id, created_at__lt=oldest_msg_created_at
+                ).exclude(creator__id__in=blocked_user_ids)
+            ).order_by("-created_at")[:NUM_MESSAGES_PER_PAGE][::-1]
         ]
     return messages
 
 
 def change_user_display_name(user, new_name):
-    rooms_to_refresh = [str(room["id"]) for room in user.room_set.all().values()]
-    users_to_refresh = [
-        str(conversation["participant__username"])
-        for conversation in Conversation.objects.filter(
-            latest_message__creator=user
-        ).values("participant__username")
-    ]
     try:
         User.objects.filter(id=user.id).update(display_name=new_name)
-        return True, new_name, rooms_to_refresh, users_to_refresh
     except IntegrityError:
-        return False, new_name, rooms_to_refresh, users_to_refresh
+        return False, new_name, [], []
+    rooms_to_refresh = [
+        str(room_id) for room_id in user.room_set.values_list("id", flat=True)
+    ]
+    users_to_refresh = list(
+        Conversation.objects.filter(latest_message__creator=user)
+        .values_list("participant__username", flat=True)
+        .distinct()
+    )
+    return True, new_name, rooms_to_refresh, users_to_refresh
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.18 on 2026-10-15 09:12
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_room_members(apps, schema_editor):
+    Room = apps.get_model('mullmine', 'Room')
+    num_members = (
+        Room.members.through.objects.filter(room_id=OuterRef('pk'))
+        .values('room_id')
+        .annotate(count=Count('*'))
+        .values('count')
+    )
+    Room.objects.update(num_members=Coalesce(Subquery(num_members), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mullmine', '0003_remove_user_agreed_terms_and_privacy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='room',
+            name='num_members',
+            field=models.PositiveSmallIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(count_room_members, migrations.RunPython.noop),
+    ]
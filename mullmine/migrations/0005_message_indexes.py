@@ -0,0 +1,24 @@
+# Generated by Django 4.2.18 on 2026-10-15 10:04
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('mullmine', '0004_room_num_members'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='message',
+            index=models.Index(fields=['room', '-created_at'], name='msg_room_created_desc_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='message',
+            index=models.Index(fields=['room', 'creator'], name='msg_room_creator_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.18 on 2026-10-15 12:31
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('mullmine', '0005_message_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='conversation',
+            index=models.Index(fields=['participant', 'room'], name='conv_participant_room_idx'),
+        ),
+    ]
@@ -36,6 +36,7 @@ class Room(models.Model):
     members = models.ManyToManyField(User)
     created_at = models.DateTimeField(auto_now_add=True)
     question = models.CharField(max_length=255)
+    num_members = models.PositiveSmallIntegerField(default=0, db_index=True)
 
 
 class Message(models.Model):
@@ -45,6 +46,14 @@ class Message(models.Model):
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["room", "-created_at"], name="msg_room_created_desc_idx"
+            ),
+            models.Index(fields=["room", "creator"], name="msg_room_creator_idx"),
+        ]
+
 
 class Conversation(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -53,3 +62,10 @@ class Conversation(models.Model):
     latest_message = models.ForeignKey(Message, on_delete=models.SET_NULL, null=True)
     read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["participant", "room"], name="conv_participant_room_idx"
+            ),
+        ]
@@ -0,0 +1,41 @@
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed, post_delete, pre_delete
+from django.dispatch import receiver
+
+from mullmine.models import Room, User
+
+
+def count_members(room_ids):
+    rooms = Room.objects.filter(pk__in=room_ids)
+    # Lock first so the recount sees members added by joins we waited on.
+    list(rooms.select_for_update(no_key=True).order_by("pk").values_list("pk"))
+    num_members = (
+        Room.members.through.objects.filter(room_id=OuterRef("pk"))
+        .values("room_id")
+        .annotate(count=Count("*"))
+        .values("count")
+    )
+    rooms.update(num_members=Coalesce(Subquery(num_members), 0))
+
+
+@receiver(m2m_changed, sender=Room.members.through)
+def count_changed_members(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        instance._cleared_room_ids = list(
+            instance.room_set.values_list("id", flat=True)
+        )
+    elif action in ("post_add", "post_remove") and pk_set:
+        count_members(pk_set if reverse else [instance.pk])
+    elif action == "post_clear":
+        count_members(instance._cleared_room_ids if reverse else [instance.pk])
+
+
+@receiver(pre_delete, sender=User)
+def remember_member_rooms(sender, instance, **kwargs):
+    instance._member_room_ids = list(instance.room_set.values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=User)
+def count_deleted_member(sender, instance, **kwargs):
+    count_members(instance._member_room_ids)
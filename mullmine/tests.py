@@ -0,0 +1,109 @@
+from django.test import TestCase
+
+from mullmine.exceptions import RoomFull
+from mullmine.helpers import (
+    add_user_to_room,
+    check_room_full,
+    initialize_room,
+    leave_room,
+)
+from mullmine.models import Conversation, Room, User
+
+
+class RoomNumMembersTest(TestCase):
+    def setUp(self):
+        self.room = Room.objects.create(question="What?")
+        self.users = [
+            User.objects.create(
+                username=f"user{i}", display_name=f"User {i}", is_verified=True
+            )
+            for i in range(6)
+        ]
+
+    def assertNumMembersCorrect(self, room):
+        room.refresh_from_db()
+        self.assertEqual(room.num_members, room.members.count())
+
+    def test_join_room(self):
+        for user in self.users[:5]:
+            add_user_to_room(user, self.room)
+        add_user_to_room(self.users[0], self.room)
+        self.assertNumMembersCorrect(self.room)
+        self.assertEqual(self.room.num_members, 5)
+
+    def test_leave_room(self):
+        for user in self.users[:5]:
+            add_user_to_room(user, self.room)
+        leave_room(self.users[0], self.room.id)
+        leave_room(self.users[1], self.room.id)
+        leave_room(self.users[1], self.room.id)
+        self.assertNumMembersCorrect(self.room)
+        self.assertEqual(self.room.num_members, 3)
+        self.assertFalse(
+            Conversation.objects.filter(
+                participant=self.users[0], room=self.room
+            ).exists()
+        )
+
+    def test_last_member_leaving_deletes_room(self):
+        add_user_to_room(self.users[0], self.room)
+        add_user_to_room(self.users[1], self.room)
+        leave_room(self.users[0], self.room.id)
+        leave_room(self.users[1], self.room.id)
+        self.assertFalse(Room.objects.filter(id=self.room.id).exists())
+
+    def test_non_member_leaving_keeps_empty_room(self):
+        leave_room(self.users[0], self.room.id)
+        self.assertTrue(Room.objects.filter(id=self.room.id).exists())
+
+    def test_add_and_remove_members(self):
+        self.room.members.add(*self.users[:3])
+        self.users[3].room_set.add(self.room)
+        self.assertNumMembersCorrect(self.room)
+        self.room.members.remove(self.users[0])
+        self.users[1].room_set.remove(self.room)
+        self.assertNumMembersCorrect(self.room)
+        self.assertEqual(self.room.num_members, 2)
+
+    def test_clear_members(self):
+        other_room = Room.objects.create(question="Why?")
+        self.room.members.add(*self.users[:5])
+        other_room.members.add(*self.users[:5])
+        self.users[0].room_set.clear()
+        self.assertNumMembersCorrect(self.room)
+        self.assertNumMembersCorrect(other_room)
+        self.assertEqual(other_room.num_members, 4)
+        self.room.members.clear()
+        self.assertNumMembersCorrect(self.room)
+        self.assertEqual(self.room.num_members, 0)
+
+    def test_delete_user(self):
+        other_room = Room.objects.create(question="Why?")
+        self.room.members.add(*self.users[:5])
+        other_room.members.add(self.users[0], self.users[1])
+        self.users[0].delete()
+        self.assertNumMembersCorrect(self.room)
+        self.assertNumMembersCorrect(other_room)
+        self.assertEqual(self.room.num_members, 4)
+        self.assertEqual(other_room.num_members, 1)
+
+    def test_full_room_admits_only_members(self):
+        for user in self.users[:5]:
+            add_user_to_room(user, self.room)
+        self.assertTrue(check_room_full(initialize_room(self.room.id, self.users[5])))
+        self.assertFalse(check_room_full(initialize_room(self.room.id, self.users[0])))
+
+    def test_room_not_full_after_members_leave(self):
+        for user in self.users[:5]:
+            add_user_to_room(user, self.room)
+        leave_room(self.users[0], self.room.id)
+        self.assertFalse(check_room_full(initialize_room(self.room.id, self.users[5])))
+
+    def test_join_full_room(self):
+        for user in self.users[:5]:
+            add_user_to_room(user, self.room)
+        with self.assertRaises(RoomFull):
+            add_user_to_room(self.users[5], self.room)
+        add_user_to_room(self.users[0], self.room)
+        self.assertNumMembersCorrect(self.room)
+        self.assertEqual(self.room.num_members, 5)